@@ -1,16 +1,42 @@
 #!/usr/bin/env python3
 from mcp.server.fastmcp import FastMCP
-import requests
+import contextlib
+import asyncio
+import httpx
 import json
+import orjson
 import sys
+import time
 from typing import List, Dict, Any, Optional
 
-# Initialize FastMCP server
-mcp = FastMCP("lmstudio-bridge")
-
 # LM Studio settings
 LMSTUDIO_API_BASE = "http://192.168.50.20:1234"
 DEFAULT_MODEL = "default"  # Will be replaced with whatever model is currently loaded
+MODELS_CACHE_TTL = 30  # Seconds to reuse the model list before asking LM Studio again
+MODELS_MAX_BYTES = 1 << 20  # Largest /v1/models response body we are willing to read
+
+# Shared async HTTP client so tool calls don't block the event loop and
+# reuse pooled keep-alive connections to LM Studio. Reads are unbounded
+# because long generations can take well over a minute on local hardware.
+_http = httpx.AsyncClient(
+    base_url=LMSTUDIO_API_BASE,
+    timeout=httpx.Timeout(30.0, read=None),
+    limits=httpx.Limits(max_keepalive_connections=16, max_connections=32),
+)
+
+async def _warm_up() -> None:
+    """Open a pooled connection to LM Studio before the first tool call"""
+    try:
+        await _http.head("/v1/models", timeout=2)
+    except Exception:
+        # LM Studio may not be up yet; the first tool call will connect then
+        pass
+
+# Initialize FastMCP server
+mcp = FastMCP("lmstudio-bridge")
+
+# (TTL bucket, model IDs) from the last successful /v1/models call
+_models_cache: Optional[tuple] = None
 
 def log_error(message: str):
     """Log error messages to stderr for debugging"""
@@ -20,6 +46,44 @@ def log_info(message: str):
     """Log informational messages to stderr for debugging"""
     print(f"INFO: {message}", file=sys.stderr)
 
+async def _fetch_model_ids() -> tuple:
+    """Fetch the IDs of the models available in LM Studio.
+    
+    The model inventory rarely changes between tool calls, so a successful
+    result is reused for the rest of the current MODELS_CACHE_TTL window.
+    
+    Returns:
+        A tuple of model IDs.
+    
+    Raises:
+        httpx.HTTPStatusError: If LM Studio returns a non-200 status code.
+        ValueError: If the response body is larger than MODELS_MAX_BYTES.
+    """
+    global _models_cache
+    bucket = int(time.monotonic() // MODELS_CACHE_TTL)
+    if _models_cache is not None and _models_cache[0] == bucket:
+        return _models_cache[1]
+    
+    # Read the body incrementally so an oversized response is rejected
+    # before it is fully buffered
+    async with _http.stream("GET", "/v1/models") as response:
+        if response.status_code != 200:
+            raise httpx.HTTPStatusError(
+                f"LM Studio returned status code {response.status_code}",
+                request=response.request,
+                response=response,
+            )
+        
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body += chunk
+            if len(body) > MODELS_MAX_BYTES:
+                raise ValueError(f"Model list exceeds {MODELS_MAX_BYTES} bytes")
+    
+    model_ids = tuple(model["id"] for model in orjson.loads(body).get("data", []))
+    _models_cache = (bucket, model_ids)
+    return model_ids
+
 @mcp.tool()
 async def health_check() -> str:
     """Check if LM Studio API is accessible.
@@ -28,7 +92,7 @@ async def health_check() -> str:
         A message indicating whether the LM Studio API is running.
     """
     try:
-        response = requests.get(f"{LMSTUDIO_API_BASE}/v1/models")
+        response = await _http.get("/v1/models")
         if response.status_code == 200:
             return "LM Studio API is running and accessible."
         else:
@@ -44,19 +108,18 @@ async def list_models() -> str:
         A formatted list of available models.
     """
     try:
-        response = requests.get(f"{LMSTUDIO_API_BASE}/v1/models")
-        if response.status_code != 200:
-            return f"Failed to fetch models. Status code: {response.status_code}"
-        
-        models = response.json().get("data", [])
-        if not models:
+        model_ids = await _fetch_model_ids()
+        if not model_ids:
             return "No models found in LM Studio."
         
-        result = "Available models in LM Studio:\n\n"
-        for model in models:
-            result += f"- {model['id']}\n"
+        parts = ["Available models in LM Studio:\n\n"]
+        for model_id in model_ids:
+            parts.append(f"- {model_id}\n")
         
-        return result
+        return "".join(parts)
+    except httpx.HTTPStatusError as e:
+        log_error(f"Error in list_models: {str(e)}")
+        return f"Failed to fetch models. Status code: {e.response.status_code}"
     except Exception as e:
         log_error(f"Error in list_models: {str(e)}")
         return f"Error listing models: {str(e)}"
@@ -71,8 +134,8 @@ async def get_current_model() -> str:
     try:
         # LM Studio doesn't have a direct endpoint for currently loaded model
         # We'll check which model responds to a simple completion request
-        response = requests.post(
-            f"{LMSTUDIO_API_BASE}/v1/chat/completions",
+        response = await _http.post(
+            "/v1/chat/completions",
             json={
                 "messages": [{"role": "system", "content": "What model are you?"}],
                 "temperature": 0.7,
@@ -84,7 +147,7 @@ async def get_current_model() -> str:
             return f"Failed to identify current model. Status code: {response.status_code}"
         
         # Extract model info from response
-        model_info = response.json().get("model", "Unknown")
+        model_info = orjson.loads(response.content).get("model", "Unknown")
         return f"Currently loaded model: {model_info}"
     except Exception as e:
         log_error(f"Error in get_current_model: {str(e)}")
@@ -115,29 +178,65 @@ async def chat_completion(prompt: str, system_prompt: str = "", temperature: flo
         
         log_info(f"Sending request to LM Studio with {len(messages)} messages")
         
-        response = requests.post(
-            f"{LMSTUDIO_API_BASE}/v1/chat/completions",
+        # Stream the completion so tokens are consumed as LM Studio generates
+        # them instead of buffering the whole response body
+        received_choices = False
+        finished = False
+        parts = []
+        async with _http.stream(
+            "POST",
+            "/v1/chat/completions",
             json={
                 "messages": messages,
                 "temperature": temperature,
-                "max_tokens": max_tokens
+                "max_tokens": max_tokens,
+                "stream": True
             }
-        )
-        
-        if response.status_code != 200:
-            log_error(f"LM Studio API error: {response.status_code}")
-            return f"Error: LM Studio returned status code {response.status_code}"
+        ) as response:
+            if response.status_code != 200:
+                log_error(f"LM Studio API error: {response.status_code}")
+                return f"Error: LM Studio returned status code {response.status_code}"
+            
+            async for line in response.aiter_lines():
+                # Server-sent events: "data: {...}" lines, terminated by "data: [DONE]"
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    finished = True
+                    break
+                
+                event = orjson.loads(data)
+                
+                # LM Studio reports failures mid-stream as an error event
+                error = event.get("error")
+                if error:
+                    message = error.get("message", str(error)) if isinstance(error, dict) else str(error)
+                    log_error(f"LM Studio stream error: {message}")
+                    return f"Error: {message}"
+                
+                choices = event.get("choices") or []
+                if not choices:
+                    continue
+                received_choices = True
+                
+                delta = choices[0].get("delta") or {}
+                if delta.get("content"):
+                    parts.append(delta["content"])
+                if choices[0].get("finish_reason"):
+                    finished = True
         
-        response_json = response.json()
         log_info(f"Received response from LM Studio")
         
-        # Extract the assistant's message
-        choices = response_json.get("choices", [])
-        if not choices:
+        # A stream that closes without [DONE] or a finish_reason was cut off
+        if not finished:
+            log_error("LM Studio stream ended before the completion finished")
+            return "Error: LM Studio stream ended before the completion finished"
+        
+        if not received_choices:
             return "Error: No response generated"
         
-        message = choices[0].get("message", {})
-        content = message.get("content", "")
+        content = "".join(parts)
         
         if not content:
             return "Error: Empty response from model"
@@ -147,10 +246,23 @@ async def chat_completion(prompt: str, system_prompt: str = "", temperature: flo
         log_error(f"Error in chat_completion: {str(e)}")
         return f"Error generating completion: {str(e)}"
 
+async def _serve():
+    """Run the stdio server, warming up the shared HTTP client first and closing it on exit"""
+    # Done here rather than in a lifespan hook, which FastMCP enters once per
+    # session, so one session ending can't break the others
+    warm_up = asyncio.create_task(_warm_up())
+    try:
+        await mcp.run_stdio_async()
+    finally:
+        warm_up.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await warm_up
+        await _http.aclose()
+
 def main():
     """Entry point for the package when installed via pip"""
     log_info("Starting LM Studio Bridge MCP Server")
-    mcp.run(transport='stdio')
+    asyncio.run(_serve())
 
 if __name__ == "__main__":
     # Initialize and run the server
@@ -21,7 +21,8 @@ setup(
     ],
     python_requires=">=3.7",
     install_requires=[
-        "requests",
+        "httpx",
+        "orjson",
         "mcp[cli]",
         "openai>=1.0.0",
     ],